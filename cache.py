@@ -0,0 +1,93 @@
+# cache.py
+"""
+Small persistent response cache for EcoMind AI.
+
+- Stores model responses in a local SQLite database keyed by a SHA-256 digest
+  of the request parameters (see gemini.call_gemini).
+- Location defaults to ~/.ecomind_cache; override with ECOMIND_CACHE_DIR.
+- Set ECOMIND_DISABLE_CACHE=1 to turn caching off entirely.
+
+Cache failures are never fatal: any SQLite error is treated as a miss so a broken
+or read-only cache directory can't take down an LLM call.
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from typing import Optional
+
+DEFAULT_CACHE_DIR = "~/.ecomind_cache"
+DEFAULT_EXPIRE = 7 * 86400  # one week
+
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return os.environ.get("ECOMIND_DISABLE_CACHE", "").lower() not in ("1", "true", "yes")
+
+
+def _connect() -> Optional[sqlite3.Connection]:
+    global _conn
+    if _conn is not None:
+        return _conn
+    cache_dir = os.path.expanduser(os.environ.get("ECOMIND_CACHE_DIR") or DEFAULT_CACHE_DIR)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Streamlit runs each session in its own thread; all access goes through _lock.
+    conn = sqlite3.connect(os.path.join(cache_dir, "responses.sqlite3"), check_same_thread=False)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS responses ("
+        "key TEXT PRIMARY KEY, text TEXT NOT NULL, ts INTEGER NOT NULL, expires INTEGER)"
+    )
+    conn.commit()
+    _conn = conn
+    return _conn
+
+
+def get(key: str) -> Optional[str]:
+    """Return the cached text for key, or None on a miss / expired entry."""
+    if not enabled():
+        return None
+    try:
+        with _lock:
+            conn = _connect()
+            row = conn.execute("SELECT text, expires FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            text, expires = row
+            if expires is not None and expires < time.time():
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            return text
+    except (sqlite3.Error, OSError):
+        return None
+
+
+def set(key: str, text: str, expire: Optional[int] = DEFAULT_EXPIRE) -> None:
+    """Store text under key. expire is a lifetime in seconds (None = never expires)."""
+    if not enabled():
+        return
+    now = int(time.time())
+    try:
+        with _lock:
+            conn = _connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, text, ts, expires) VALUES (?, ?, ?, ?)",
+                (key, text, now, now + expire if expire is not None else None),
+            )
+            conn.commit()
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def clear() -> None:
+    """Remove every cached response."""
+    try:
+        with _lock:
+            conn = _connect()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+    except (sqlite3.Error, OSError):
+        pass
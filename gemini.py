@@ -3,8 +3,12 @@
 Gemini API wrapper and domain-specific helper functions for EcoMind AI.
 
 This module:
-- Reads API key from environment (GOOGLE_API_KEY) or streamlit secrets (optional).
-- Contains call_gemini() to send prompts to Google Generative API (Gemini).
+- Reads API keys from environment (GOOGLE_API_KEY / GOOGLE_API_KEYS) or streamlit secrets (optional).
+- Contains call_gemini() to send prompts to the Google Generative Language REST API (Gemini).
+  Low-temperature responses are cached on disk (see cache.py).
+- Contains call_gemini_async() (httpx) plus async variants of the analysis helpers so
+  independent calls can run concurrently (see analyze_project_bundle() and its sync
+  wrapper analyze_project_bundle_sync()).
 - Contains analyze_sdg(), generate_pitch(), reverse_ideas() helpers that:
   - construct structured prompts
   - ask Gemini to return JSON ONLY
@@ -16,9 +20,37 @@ This wrapper attempts to be resilient by detecting common response shapes.
 
 import os
 import json
-import time
+import asyncio
+import atexit
+import hashlib
+import itertools
+import threading
+import weakref
+import orjson
+import functools
+from collections import deque
+import httpx
 import requests
-from typing import Dict, Any, List, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3Error
+from urllib3.util.retry import Retry
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+try:
+    import ijson
+except Exception:
+    # optional: without ijson, responses are buffered and decoded in one go
+    ijson = None
+
+# Optional Streamlit import (for st.secrets), resolved once at import time rather than per call.
+try:
+    import streamlit as _ST
+except Exception:
+    _ST = None
+
+import cache as _cache
+import semantic_cache
+from ratelimit import limiter_for
 
 # Default model - change if you have a different stable name available
 DEFAULT_MODEL = "gemini-1.5-flash"
@@ -26,7 +58,120 @@ DEFAULT_MODEL = "gemini-1.5-flash"
 # Endpoint base for Google Generative Language API (v1). Adjust if your account uses a different path.
 BASE_URL = "https://generativelanguage.googleapis.com/v1/models"
 
-def _get_api_key() -> Optional[str]:
+# Responses are only cached for (near-)deterministic calls; high-temperature output
+# such as idea generation is expected to vary between runs.
+CACHE_MAX_TEMPERATURE = 0.2
+CACHE_EXPIRE = 7 * 86400
+
+# Gemini 2.5+ models think before answering and those tokens count against
+# maxOutputTokens, so the per-call caps (sized for the JSON answer alone) get this
+# much extra room on them.
+THINKING_MODEL_PREFIXES = ("gemini-2.5", "gemini-3")
+THINKING_TOKEN_HEADROOM = 8192
+
+# Network errors and these 5xx statuses are retried up to SERVER_RETRIES times with
+# urllib3's exponential backoff schedule; call_gemini_async follows the same schedule.
+SERVER_RETRIES = 3
+RETRY_BACKOFF_FACTOR = 1.0
+RETRY_STATUSES = (500, 502, 503, 504)
+
+# Shared HTTP session so back-to-back calls reuse the pooled TLS connection to the API host.
+# The adapter retries connection errors and 5xx responses with exponential backoff;
+# raise_on_status=False hands the final response back to call_gemini. 429s are left to
+# the adaptive limiter in ratelimit.py so the request rate backs off across calls.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=SERVER_RETRIES,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=list(RETRY_STATUSES),
+        allowed_methods=["POST"],
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    ),
+))
+
+# Shared HTTP/2 clients for call_gemini_async: concurrent calls are multiplexed over one
+# TLS connection. httpx connections are bound to the event loop that opened them, so
+# there is one client per running loop (sync wrappers such as analyze_sdg_batch start a
+# fresh loop with asyncio.run each time).
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _backoff_delay(failures: int) -> float:
+    """Sleep before retry number `failures`, on urllib3 Retry's schedule (0, 2, 4, ... s)."""
+    if failures <= 1:
+        return 0.0
+    return RETRY_BACKOFF_FACTOR * 2 ** (failures - 1)
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = _ASYNC_CLIENTS[loop] = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+            timeout=60,
+        )
+    return client
+
+
+def _run_async(coro):
+    """asyncio.run() for sync wrappers; closes this loop's shared client before the loop ends."""
+    async def _runner():
+        try:
+            return await coro
+        finally:
+            client = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+            if client is not None:
+                await client.aclose()
+    return asyncio.run(_runner())
+
+
+@atexit.register
+def _close_async_clients() -> None:
+    for loop, client in list(_ASYNC_CLIENTS.items()):
+        # clients on loops that already finished went down with their connections
+        if client.is_closed or loop.is_closed() or loop.is_running():
+            continue
+        try:
+            loop.run_until_complete(client.aclose())
+        except Exception:
+            pass
+    _ASYNC_CLIENTS.clear()
+
+
+def _get_api_keys() -> Tuple[str, ...]:
+    """
+    All configured API keys, in rotation order: the comma-separated GOOGLE_API_KEYS
+    (env var or st.secrets) followed by the single key from GOOGLE_API_KEY /
+    GOOGLE_API_KEY_STAGING / st.secrets["GOOGLE_API_KEY"].
+    Memoized once keys are found, so the env/st.secrets lookup runs once per process;
+    an empty result is not kept, so keys added to secrets.toml or the env later are picked up.
+    Call clear_api_key_cache() after changing keys at runtime.
+    """
+    keys = _load_api_keys()
+    if not keys:
+        _load_api_keys.cache_clear()
+    return keys
+
+
+@functools.lru_cache(maxsize=1)
+def _load_api_keys() -> Tuple[str, ...]:
+    keys: List[str] = []
+    pool = os.environ.get("GOOGLE_API_KEYS")
+    if not pool and _ST is not None:
+        try:
+            pool = _ST.secrets.get("GOOGLE_API_KEYS")
+        except Exception:
+            pass
+    if isinstance(pool, str):
+        pool = pool.split(",")
+    keys.extend(k.strip() for k in pool or [])
+
     # prefer environment variable
     api_key = os.environ.get("GOOGLE_API_KEY")
     # Allow using GOOGLE_API_KEY_STAGING or other names
@@ -35,248 +180,485 @@ def _get_api_key() -> Optional[str]:
 
     # If running under Streamlit, users may have set the key in `st.secrets`.
     # Try to read that as a fallback without making Streamlit a hard dependency.
-    if not api_key:
+    if not api_key and _ST is not None:
         try:
-            import streamlit as _st
-            api_key = _st.secrets.get("GOOGLE_API_KEY")
+            api_key = _ST.secrets.get("GOOGLE_API_KEY")
         except Exception:
-            # ignore if streamlit is not installed or secrets not available
+            # ignore if secrets are not available
             pass
+    if api_key:
+        keys.append(api_key)
+
+    return tuple(dict.fromkeys(k for k in keys if k))
+
+
+# Round-robin over all configured keys so traffic is spread across per-key quotas.
+_KEY_CYCLE: Optional[Iterator[str]] = None
+_KEY_LOCK = threading.Lock()
+
+
+def _next_api_key() -> Optional[str]:
+    global _KEY_CYCLE
+    with _KEY_LOCK:
+        if _KEY_CYCLE is None:
+            keys = _get_api_keys()
+            if not keys:
+                return None
+            _KEY_CYCLE = itertools.cycle(keys)
+        return next(_KEY_CYCLE)
+
+
+def clear_api_key_cache() -> None:
+    """Forget the memoized API keys so the next call re-reads env vars / st.secrets."""
+    global _KEY_CYCLE
+    _load_api_keys.cache_clear()
+    with _KEY_LOCK:
+        _KEY_CYCLE = None
+
+
+def _cache_key(prompt: str, model: str, temperature: float, max_output_tokens: int,
+               system: Optional[str] = None) -> str:
+    raw = orjson.dumps({"m": model, "t": temperature, "x": max_output_tokens, "s": system, "p": prompt},
+                       option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(raw).hexdigest()
+
+
+# Endpoint suffixes tried in order; 404 on one moves on to the next.
+# :generateContent is the Gemini surface; the others are older text-generation surfaces.
+SUFFIX_CANDIDATES = [":generateContent", ":generateText", ":generate"]
+
+
+def _output_token_limit(model: str, max_output_tokens: int) -> int:
+    if model.startswith(THINKING_MODEL_PREFIXES):
+        return max_output_tokens + THINKING_TOKEN_HEADROOM
+    return max_output_tokens
+
+
+def _build_payload(suffix: str, prompt: str, system: Optional[str],
+                   temperature: float, max_output_tokens: int) -> Dict[str, Any]:
+    if suffix == ":generateContent":
+        # Static instructions go first as their own part so the prefix is identical
+        # across calls and can be served from Gemini's prompt cache.
+        parts = [{"text": system}] if system else []
+        parts.append({"text": prompt})
+        return {
+            "contents": [{"role": "user", "parts": parts}],
+            "generationConfig": {"temperature": temperature, "maxOutputTokens": max_output_tokens},
+        }
+    return {
+        "prompt": {
+            "text": system + "\n" + prompt if system else prompt
+        },
+        "temperature": temperature,
+        "maxOutputTokens": max_output_tokens,
+    }
 
-    return api_key
 
 def call_gemini(prompt: str,
                 model: str = DEFAULT_MODEL,
                 temperature: float = 0.2,
                 max_output_tokens: int = 700,
-                retry: int = 2) -> str:
+                retry: int = 2,
+                cache: bool = True,
+                system: Optional[str] = None) -> str:
     """
     Call the Google Generative Language API (Gemini) via REST and return the text output.
     Expects the model to produce textual output (we request JSON in the prompt).
     Set GOOGLE_API_KEY in env vars before calling.
+
+    `system` is an optional static instruction block sent ahead of `prompt`. Keep it free
+    of per-call data so the provider can reuse its cached prefix between calls.
+
+    `retry` is the number of extra attempts after a 429 (rate limited) response;
+    network errors and 5xx are retried by the shared session's adapter.
+
+    When `cache` is True and temperature <= CACHE_MAX_TEMPERATURE, responses are
+    served from / stored in the local response cache (see cache.py).
     """
-    api_key = _get_api_key()
-    if not api_key:
+    use_cache = cache and temperature <= CACHE_MAX_TEMPERATURE
+    key = _cache_key(prompt, model, temperature, max_output_tokens, system) if use_cache else None
+    if key:
+        hit = _cache.get(key)
+        if hit is not None:
+            return hit
+
+    text, cacheable = _call_gemini_uncached(prompt, model=model, temperature=temperature,
+                                            max_output_tokens=max_output_tokens, retry=retry,
+                                            system=system)
+    if key and cacheable:
+        _cache.set(key, text, expire=CACHE_EXPIRE)
+    return text
+
+
+def _call_gemini_uncached(prompt: str,
+                          model: str,
+                          temperature: float,
+                          max_output_tokens: int,
+                          retry: int,
+                          system: Optional[str] = None) -> Tuple[str, bool]:
+    """
+    Returns (text, cacheable). cacheable is True only when the text came from the
+    model's candidates/output, not from a blocked or undecodable response body.
+    """
+    if not _get_api_keys():
         raise RuntimeError("Google API key not set. Set environment variable GOOGLE_API_KEY.")
 
     headers = {"Content-Type": "application/json; charset=utf-8"}
 
-    payload = {
-        "prompt": {
-            "text": prompt
-        },
-        "temperature": temperature,
-        "maxOutputTokens": max_output_tokens,
-    }
-
-    # If the official google.generativeai SDK is installed and an API key is available,
-    # prefer using it (simpler auth and model handling). Fall back to REST if the SDK
-    # is not available or the call fails.
-    try:
-        import google.generativeai as genai
-        api_key = _get_api_key()
-        if api_key:
-            try:
-                genai.configure(api_key=api_key)
-                # The SDK uses a model object; try a simple generate call.
-                gm = genai.GenerativeModel(model)
-                # Try a couple of common call signatures depending on SDK version.
-                try:
-                    resp = gm.generate_content(prompt)
-                except TypeError:
-                    # some SDK versions expect keyword args
-                    resp = gm.generate_content(prompt=prompt, temperature=temperature)
-
-                # Extract text from response if possible
-                if hasattr(resp, 'text'):
-                    return resp.text
-                # some SDKs return a dict-like object
-                try:
-                    rj = resp if isinstance(resp, dict) else resp.to_dict()
-                    # look for common keys
-                    if isinstance(rj, dict):
-                        # try to find text in nested keys
-                        def _find_text(obj):
-                            if isinstance(obj, str):
-                                return obj
-                            if isinstance(obj, dict):
-                                for v in obj.values():
-                                    t = _find_text(v)
-                                    if t:
-                                        return t
-                            if isinstance(obj, list):
-                                for item in obj:
-                                    t = _find_text(item)
-                                    if t:
-                                        return t
-                            return None
-                        t = _find_text(rj)
-                        if t:
-                            return t
-                except Exception:
-                    pass
-            except Exception:
-                # If SDK call fails, continue to REST fallback
-                pass
-    except Exception:
-        # SDK not installed — ignore and use REST logic below
-        pass
-
     # Try multiple common endpoint suffixes to handle API surface differences.
-    suffix_candidates = [":generateText", ":generate"]
     attempted_urls = []
 
-    for suffix in suffix_candidates:
+    for suffix in SUFFIX_CANDIDATES:
         url = f"{BASE_URL}/{model}{suffix}"
         attempted_urls.append(url)
-
+        payload = _build_payload(suffix, prompt, system, temperature,
+                                 _output_token_limit(model, max_output_tokens))
+
+        # Network errors and 5xx are retried by the session's Retry adapter; 429s are
+        # retried here after the limiter has slowed down and waited out Retry-After.
+        # generateContent bodies have a known shape, so they are streamed through ijson
+        # instead of buffering the whole response first.
+        stream = ijson is not None and suffix == ":generateContent"
         for attempt in range(retry + 1):
+            # each attempt takes the next key, so a 429 on one key fails over to another
+            api_key = _next_api_key()
+            limiter = limiter_for(url, api_key)
+            limiter.acquire()
             try:
-                resp = requests.post(url, headers=headers, params={"key": api_key}, json=payload, timeout=60)
+                resp = _SESSION.post(url, headers=headers, params={"key": api_key}, json=payload,
+                                     timeout=60, stream=stream)
             except requests.RequestException as re:
-                # network-level error — retry if possible
-                if attempt < retry:
-                    time.sleep(1 + attempt * 2)
-                    continue
                 raise RuntimeError(f"Network error calling Gemini endpoint {url}: {re}")
+            if resp.status_code != 429:
+                break
+            limiter.penalize(resp.headers.get("Retry-After"))
+            if attempt < retry:
+                # the last 429 stays open so its body can go into the error below
+                resp.close()
+
+        if resp.status_code == 200:
+            limiter.reward()
+            if stream:
+                with resp:
+                    return _read_streamed_text(resp, url)
+            try:
+                data = orjson.loads(resp.content)
+            except Exception:
+                return resp.text, False
+            return _text_from_rest_data(data)
 
-            if resp.status_code == 200:
-                try:
-                    data = resp.json()
-                except Exception:
-                    return resp.text
-
-                # Typical response shapes — extract textual content if present
-                text = None
-                if isinstance(data, dict):
-                    if "candidates" in data:
-                        c0 = data["candidates"][0]
-                        text = c0.get("output") or (c0.get("content") and "".join([seg.get("text", "") for seg in c0.get("content", [])]))
-                    elif "result" in data and "candidates" in data["result"]:
-                        c0 = data["result"]["candidates"][0]
-                        text = c0.get("output") or (c0.get("content") and "".join([seg.get("text", "") for seg in c0.get("content", [])]))
-                    elif "output" in data:
-                        text = data.get("output")
-
-                if not text:
-                    def extract_text_recursive(obj):
-                        if isinstance(obj, str):
-                            return obj
-                        if isinstance(obj, dict):
-                            for v in obj.values():
-                                t = extract_text_recursive(v)
-                                if t:
-                                    return t
-                        if isinstance(obj, list):
-                            for item in obj:
-                                t = extract_text_recursive(item)
-                                if t:
-                                    return t
-                        return None
-                    text = extract_text_recursive(data)
-
-                if not text:
-                    return json.dumps(data, indent=2)
-                return text.strip()
+        # 404 often means incorrect model name or endpoint — try next suffix
+        if resp.status_code == 404:
+            resp.close()
+            continue
+        # other error — raise with context
+        raise RuntimeError(f"Gemini API error {resp.status_code} from {url}: {resp.text}")
 
-            else:
-                # 404 often means incorrect model name or endpoint — try next suffix
-                if resp.status_code == 404:
-                    # break to try next suffix
-                    break
-                # retry on 5xx
-                if resp.status_code >= 500 and attempt < retry:
-                    time.sleep(1 + attempt * 2)
+    # If we get here, none of the suffixes returned success
+    raise _not_found_error(attempted_urls)
+
+
+class _RecordingReader:
+    """File-like wrapper that keeps the bytes read so far, for the non-streaming fallback."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.chunks: List[bytes] = []
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.raw.read(size)
+        self.chunks.append(chunk)
+        return chunk
+
+
+def _read_streamed_text(resp: requests.Response, url: str) -> Tuple[str, bool]:
+    """
+    Incrementally parse the candidates of a streamed generateContent body and pull the
+    text out of them (see _text_from_rest_data). Falls back to decoding the full body
+    when there are no candidates (e.g. a blocked prompt).
+    Raises RuntimeError if the connection drops or the body ends mid-document.
+    """
+    resp.raw.decode_content = True
+    reader = _RecordingReader(resp.raw)
+    try:
+        try:
+            candidates = list(ijson.items(reader, "candidates.item", use_float=True))
+        except ijson.JSONError:
+            candidates = []
+        body = None if candidates else b"".join(reader.chunks) + resp.raw.read()
+    except (Urllib3Error, requests.RequestException) as ne:
+        raise RuntimeError(f"Network error calling Gemini endpoint {url}: {ne}")
+    if candidates:
+        return _text_from_rest_data({"candidates": candidates})
+
+    try:
+        data = orjson.loads(body)
+    except ValueError:
+        # a body cut off mid-stream is not model output; don't hand it back as text
+        raise RuntimeError(f"Truncated or invalid JSON response from Gemini endpoint {url}")
+    return _text_from_rest_data(data)
+
+
+async def call_gemini_async(prompt: str,
+                            model: str = DEFAULT_MODEL,
+                            temperature: float = 0.2,
+                            max_output_tokens: int = 700,
+                            retry: int = 2,
+                            cache: bool = True,
+                            system: Optional[str] = None) -> str:
+    """
+    Async counterpart of call_gemini() for running several Gemini calls concurrently
+    (e.g. with asyncio.gather). Uses the REST endpoints only, with the same endpoint
+    suffix fallback, retry behaviour and response cache as the sync version.
+    Requests share one HTTP/2 client per event loop.
+    """
+    use_cache = cache and temperature <= CACHE_MAX_TEMPERATURE
+    key = _cache_key(prompt, model, temperature, max_output_tokens, system) if use_cache else None
+    if key:
+        hit = _cache.get(key)
+        if hit is not None:
+            return hit
+
+    if not _get_api_keys():
+        raise RuntimeError("Google API key not set. Set environment variable GOOGLE_API_KEY.")
+
+    headers = {"Content-Type": "application/json; charset=utf-8"}
+    attempted_urls = []
+
+    client = _get_async_client()
+    for suffix in SUFFIX_CANDIDATES:
+        url = f"{BASE_URL}/{model}{suffix}"
+        attempted_urls.append(url)
+        payload = _build_payload(suffix, prompt, system, temperature,
+                                 _output_token_limit(model, max_output_tokens))
+
+        # 429s get `retry` extra attempts, paced by the limiter; network errors and
+        # RETRY_STATUSES get SERVER_RETRIES, as the sync session's Retry adapter does.
+        rate_limited = failures = 0
+        while True:
+            api_key = _next_api_key()
+            limiter = limiter_for(url, api_key)
+            await limiter.acquire_async()
+            try:
+                resp = await client.post(url, headers=headers, params={"key": api_key}, json=payload)
+            except httpx.HTTPError as he:
+                if failures < SERVER_RETRIES:
+                    failures += 1
+                    await asyncio.sleep(_backoff_delay(failures))
                     continue
-                # other error — raise with context
-                raise RuntimeError(f"Gemini API error {resp.status_code} from {url}: {resp.text}")
+                raise RuntimeError(f"Network error calling Gemini endpoint {url}: {he}")
 
-    # If we get here, none of the suffixes returned success
-    raise RuntimeError(
+            if resp.status_code == 429:
+                # this key's limiter holds further requests until Retry-After has passed
+                limiter.penalize(resp.headers.get("Retry-After"))
+                if rate_limited < retry:
+                    rate_limited += 1
+                    continue
+            elif resp.status_code in RETRY_STATUSES and failures < SERVER_RETRIES:
+                failures += 1
+                await asyncio.sleep(_backoff_delay(failures))
+                continue
+            break
+
+        if resp.status_code == 200:
+            limiter.reward()
+            try:
+                data = orjson.loads(resp.content)
+            except Exception:
+                text, cacheable = resp.text, False
+            else:
+                text, cacheable = _text_from_rest_data(data)
+            if key and cacheable:
+                _cache.set(key, text, expire=CACHE_EXPIRE)
+            return text
+
+        if resp.status_code == 404:
+            continue
+        raise RuntimeError(f"Gemini API error {resp.status_code} from {url}: {resp.text}")
+
+    raise _not_found_error(attempted_urls)
+
+
+def _candidate_text(data: Any) -> Optional[str]:
+    """Generated text on the known Gemini / legacy response paths, or None."""
+    if isinstance(data, dict):
+        for root in (data, data.get("result")):
+            try:
+                c0 = root["candidates"][0]
+            except (KeyError, IndexError, TypeError):
+                continue
+            try:
+                parts = c0["content"]["parts"]
+                text = "".join(p.get("text", "") for p in parts if isinstance(p, dict))
+                if text:
+                    return text
+            except (KeyError, TypeError):
+                pass
+            if isinstance(c0, dict):
+                if c0.get("output"):
+                    return c0["output"]
+                content = c0.get("content")
+                # older surfaces return content as a bare list of segments
+                if isinstance(content, list):
+                    text = "".join(seg.get("text", "") for seg in content if isinstance(seg, dict))
+                    if text:
+                        return text
+        if isinstance(data.get("output"), str) and data["output"]:
+            return data["output"]
+    return None
+
+
+def _finish_reason(data: Any) -> Optional[str]:
+    """finishReason of the first candidate, or None (legacy surfaces don't report one)."""
+    if isinstance(data, dict):
+        for root in (data, data.get("result")):
+            try:
+                return root["candidates"][0].get("finishReason")
+            except (KeyError, IndexError, TypeError, AttributeError):
+                continue
+    return None
+
+
+def _extract_text(data: Any) -> Optional[str]:
+    """
+    Find the generated text in a decoded REST response.
+    Tries the known Gemini / legacy response paths first, then falls back to the first
+    non-empty string found by an iterative depth-first walk.
+    """
+    text = _candidate_text(data)
+    if text:
+        return text
+
+    stack = deque([data])
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, str):
+            if obj:
+                return obj
+        elif isinstance(obj, dict):
+            stack.extend(reversed(list(obj.values())))
+        elif isinstance(obj, list):
+            stack.extend(reversed(obj))
+    return None
+
+
+def _text_from_rest_data(data: Any) -> Tuple[str, bool]:
+    """
+    Pull the generated text out of a decoded REST response body.
+    Raises RuntimeError when the response has candidates but none of them carry text
+    (e.g. the whole token budget went to thinking).
+    Returns (text, cacheable). Only text found on the candidate/output paths of a
+    completed generation is cacheable: not partial text cut off by MAX_TOKENS, SAFETY
+    or RECITATION, and not whatever the generic walk turns up.
+    """
+    text = _candidate_text(data)
+    if text:
+        return text.strip(), _finish_reason(data) in (None, "STOP")
+    if isinstance(data, dict) and any(isinstance(root, dict) and root.get("candidates")
+                                      for root in (data, data.get("result"))):
+        # don't let the generic walk hand back "model" / "MAX_TOKENS" as generated text
+        raise RuntimeError(f"Gemini returned no text (finishReason: {_finish_reason(data) or 'unknown'})")
+    text = _extract_text(data)
+    if not text:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8"), False
+    return text.strip(), False
+
+
+def _not_found_error(attempted_urls: List[str]) -> RuntimeError:
+    return RuntimeError(
         "Gemini API returned 404/Not found. Tried the following endpoints: " + ", ".join(attempted_urls) +
         ".\nCheck that your GOOGLE_API_KEY is correct and that the model name (e.g., 'gemini-2.5-flash') is available for your account."
     )
 
 
-def _parse_json_from_text(text: str) -> Any:
+def _parse_json_from_text(text: str, expected: type = dict) -> Any:
     """
-    Attempts to extract a JSON object from the model output text.
+    Attempts to extract a JSON object (or array) from the model output text.
     The model is instructed to return JSON only, but sometimes there are leading/trailing words.
-    This function finds the first '{' and last '}' and tries to json.loads that slice.
+    This function scans the text once, tracking bracket depth and string state, and
+    decodes the first balanced block of the `expected` top-level type (dict or list) as
+    soon as it closes. Blocks of the other type (e.g. "[1]" in prose) are skipped; they
+    are only accepted when the text contains no opener of the expected type at all.
     """
     text = text.strip()
-    # if it already seems to be JSON:
-    try:
-        return json.loads(text)
-    except Exception:
-        pass
-
-    # find first '{' and last '}'
-    first = text.find("{")
-    last = text.rfind("}")
-    if first != -1 and last != -1 and last > first:
-        candidate = text[first:last+1]
-        try:
-            return json.loads(candidate)
-        except Exception:
-            pass
-
-    # try to find JSON array
-    first_a = text.find("[")
-    last_a = text.rfind("]")
-    if first_a != -1 and last_a != -1 and last_a > first_a:
-        candidate = text[first_a:last_a+1]
-        try:
-            return json.loads(candidate)
-        except Exception:
-            pass
+    opener = "{" if expected is dict else "["
+    strict = opener in text
+    if not strict:
+        opener = "[" if opener == "{" else "{"
+    first_block = None
+    depth = 0
+    start = -1
+    in_str = False
+    esc = False
+    for i, ch in enumerate(text):
+        if depth == 0:
+            if ch == opener:
+                start = i
+                depth = 1
+            continue
+        if in_str:
+            if esc:
+                esc = False
+            elif ch == "\\":
+                esc = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                candidate = text[start:i + 1]
+                try:
+                    value = orjson.loads(candidate)
+                except ValueError:
+                    # not JSON (e.g. a bracketed aside in prose); keep scanning after it
+                    if first_block is None:
+                        first_block = candidate
+                    continue
+                if not strict or isinstance(value, expected):
+                    return value
 
-    # As fallback, try to replace single quotes with double quotes (best-effort)
-    alt = text.replace("'", '"')
+    # As fallback, try to replace single quotes with double quotes (best-effort).
+    # This rare path stays on the stdlib parser.
+    alt = (first_block or text).replace("'", '"')
     try:
         return json.loads(alt)
-    except Exception:
+    except ValueError:
         # give up and return raw text
         return {"raw_text": text}
 
 
-def analyze_sdg(project_text: str,
-                model: str = DEFAULT_MODEL) -> Dict[str, Any]:
-    """
-    Send project_text to Gemini and ask for a structured SDG analysis.
-    Returns a dict with keys:
-    - sdgs: list of {id:int, short_name:str, score:int (0-100), explanation:str}
-    - sustainability_impact: "Low"/"Medium"/"High"
-    - feasibility_score: int (1-10)
-    - risks: {environmental:[], social:[], economic:[]}
-    - recommendations: [str...]
-    - notes: optional additional notes
+# Prompt templates. The large static instruction/schema blocks are kept free of any
+# interpolation and sent as the first part of the request, with the per-call data
+# (project text, SDG numbers, context) appended after them. Keeping the prefix
+# byte-identical across calls lets Gemini reuse its cached prefix.
 
-    The prompt forces Gemini to return JSON ONLY with that structure.
-    """
-    prompt = f"""
+_ANALYZE_SDG_SYSTEM = """
 You are EcoMind AI, an expert sustainability analyst. Given a project description, produce a structured JSON analysis strictly following the JSON schema below. Do NOT include any extra commentary, only output valid JSON.
 
 Schema:
-{{
+{
   "sdgs": [
-    {{
+    {
       "id": <int 1-17>,
       "short_name": "<short SDG name>",
       "score": <int 0-100>,            // relevance 0 to 100
       "explanation": "<1-2 sentence explanation of why this SDG matches>"
-    }}
+    }
   ],
   "sustainability_impact": "<Low|Medium|High>",
   "feasibility_score": <int 1-10>,
-  "risks": {{
+  "risks": {
     "environmental": ["<short risk statements>"],
     "social": ["<short risk statements>"],
     "economic": ["<short risk statements>"]
-  }},
+  },
   "recommendations": ["<actionable recommendation 1>", "<actionable recommendation 2>"],
   "notes": "<optional short note>"
-}}
+}
 
 Instructions:
 - Analyze the following project and return between 3 and 5 most relevant SDGs only.
@@ -287,50 +669,177 @@ Instructions:
 - Provide up to 3 short risks per category (environmental/social/economic).
 - Provide 3-6 practical, AI-aware improvement recommendations (short bullet sentences).
 - Return only the JSON object (no markdown, no text).
+"""
 
-Project:
-\"\"\"{project_text}\"\"\"
+_SDG_FALLBACK_SYSTEM = (
+    "You are EcoMind AI, an expert sustainability analyst. The following project description may be short or informal.\n"
+    "Identify the 3 most relevant Sustainable Development Goals (SDG numbers 1-17) that the project aligns with.\n"
+    "Return ONLY a JSON object with a single key \"sdgs\" which is a list of objects with keys:\n"
+    "  - id: integer (1-17)\n"
+    "  - short_name: short SDG name\n"
+    "  - score: integer 0-100 indicating relevance\n"
+    "  - explanation: one brief sentence explaining the match\n"
+)
+
+_ANALYZE_SDG_BATCH_SYSTEM = _ANALYZE_SDG_SYSTEM + """
+Batch mode:
+- You will receive several numbered projects. Analyze each one independently using the schema and instructions above.
+- Return a JSON array (not an object) with exactly one analysis object per project, in the same order as the projects.
+- Return only the JSON array (no markdown, no text).
 """
 
-    response_text = call_gemini(prompt, model=model, temperature=0.15, max_output_tokens=700)
-    parsed = _parse_json_from_text(response_text)
+# Projects per batched analysis request; past ~16 rows latency and output truncation outweigh
+# the saved round trips.
+BATCH_SIZE = 8
 
-    # If we successfully parsed and have SDGs, return immediately.
-    if isinstance(parsed, dict) and parsed.get("sdgs"):
-        return parsed
+_PITCH_SYSTEM = """
+You are EcoMind AI, an expert startup / sustainability pitch writer. Given a project description, produce JSON only with these keys:
+{
+  "pitch": "<2-4 sentence marketing & technical pitch summary suitable for a slide or email>",
+  "elevator": "<one-sentence concise hook>",
+  "bullet_points": ["<3 short bullets summarizing benefits/impact/ask>"]
+}
 
-    # Fallback: sometimes the model returns useful text but misses the JSON schema.
-    # Ask a focused SDG classifier prompt to extract 3 relevant SDGs when initial parse failed.
-    try:
-        fallback_prompt = (
-            "You are EcoMind AI, an expert sustainability analyst. The following project description may be short or informal.\n"
-            "Identify the 3 most relevant Sustainable Development Goals (SDG numbers 1-17) that the project aligns with.\n"
-            "Return ONLY a JSON object with a single key \"sdgs\" which is a list of objects with keys:\n"
-            "  - id: integer (1-17)\n"
-            "  - short_name: short SDG name\n"
-            "  - score: integer 0-100 indicating relevance\n"
-            "  - explanation: one brief sentence explaining the match\n\n"
-            "Project:\n"
-            f"{project_text}\n"
-        )
+Constraints:
+- No extra commentary. Only valid JSON object.
+- Keep language clear and suitable for investors / partners; emphasize SDG impact.
+"""
 
-        fb_text = call_gemini(fallback_prompt, model=model, temperature=0.0, max_output_tokens=300)
-        fb_parsed = _parse_json_from_text(fb_text)
-        if isinstance(fb_parsed, dict) and fb_parsed.get("sdgs"):
-            # Merge into a full analysis structure, preserving any other fields from original parse if present
-            result = {
-                "sdgs": fb_parsed.get("sdgs", []),
-                "sustainability_impact": parsed.get("sustainability_impact", "Unknown") if isinstance(parsed, dict) else "Unknown",
-                "feasibility_score": parsed.get("feasibility_score", 0) if isinstance(parsed, dict) else 0,
-                "risks": parsed.get("risks", {"environmental": [], "social": [], "economic": []}) if isinstance(parsed, dict) else {"environmental": [], "social": [], "economic": []},
-                "recommendations": parsed.get("recommendations", []) if isinstance(parsed, dict) else [],
-                "notes": parsed.get("notes", "Parser fallback — SDG classifier used.") if isinstance(parsed, dict) else "Parser fallback — SDG classifier used.",
-            }
-            return result
-    except Exception:
-        # ignore fallback errors and fall through to final fallback
-        pass
+_REVERSE_IDEAS_SYSTEM = """
+You are EcoMind AI, an ideation engine for Sustainable Development Goals (SDGs).
+Given the SDG number and the project context, return JSON only with the structure:
+{
+    "sdg": <the SDG number given below>,
+    "sdg_name": "<short sdg name>",
+    "ideas": [
+        {"title": "<short idea title>", "description": "<1-2 sentence description>", "why_it_fits": "<short reasoning>", "key_steps": ["..."], "estimated_budget": "<budget range>", "improvement_suggestions": ["<short suggestion 1>"]}
+    ]
+}
+
+Requirements:
+- Return 3 to 5 distinct, realistic, and actionable project ideas aligned to the SDG and the context given below.
+- Each description must be 1-2 sentences describing scope, impact, and one practical implementation note.
+- Include a short `why_it_fits` and 2-3 `key_steps` for implementation, plus an `estimated_budget` suggestion.
+- Output ONLY valid JSON (no markdown, no commentary).
+"""
+
+_REVERSE_IDEAS_MULTI_SYSTEM = """
+You are EcoMind AI, an ideation engine for Sustainable Development Goals (SDGs).
+Given the list of SDG numbers below and an optional project context, propose 3 to 5
+distinct, realistic, and actionable project ideas that ADDRESS ALL of the listed SDGs.
+
+Return ONLY valid JSON with this structure:
+{
+  "covered_sdgs": [<the SDG numbers listed below>],
+  "ideas": [
+    {
+      "title": "<short idea title>",
+      "description": "<1-2 sentence description>",
+      "why_it_fits": "<short explanation why this idea advances each listed SDG>",
+      "key_steps": ["step 1", "step 2"],
+      "estimated_budget": "<budget range>",
+      "improvement_suggestions": ["..."],
+      "covered_sdgs": [<the SDG numbers listed below>]
+    }
+  ]
+}
+
+Requirements:
+- Each returned idea MUST address ALL of the listed SDG numbers.
+- For `why_it_fits` explicitly mention how the idea advances each SDG by number/name.
+- Provide 2-4 `key_steps` and an `estimated_budget` for implementation.
+- Output only the JSON object (no markdown or extra text).
+"""
+
+_SUGGEST_SYSTEM = """
+You are EcoMind AI, an expert sustainability advisor. Given a short project description and a target SDG number, provide a concise, prioritized list of up to 6 actionable recommendations that would increase the project's alignment to the target SDG, reduce relevant risks, and improve feasibility in practical terms.
+
+Return ONLY valid JSON with keys:
+{
+  "sdg": <target SDG number>,
+  "suggestions": ["<actionable suggestion 1>", "<actionable suggestion 2>"],
+  "notes": "<short caveats or context>"
+}
+"""
+
+
+# Trailing (per-call) parts of each prompt, filled with str.format.
+_PROJECT_TMPL = 'Project:\n"""{project_text}"""\n'
+_REVERSE_IDEAS_TMPL = "SDG: {sdg}\n\nContext (use these to tailor ideas):\n{context_text}\n"
+_REVERSE_IDEAS_MULTI_TMPL = "SDG numbers: {sdg_list}\n\nContext (use to tailor ideas):\n{context_text}\n"
+_SUGGEST_TMPL = "Target SDG: {sdg}\n\n" + _PROJECT_TMPL
+
+# name -> (static cacheable prefix, per-call template)
+_TEMPLATES = {
+    "analyze_sdg": (_ANALYZE_SDG_SYSTEM, _PROJECT_TMPL),
+    "sdg_fallback": (_SDG_FALLBACK_SYSTEM, _PROJECT_TMPL),
+    "pitch": (_PITCH_SYSTEM, _PROJECT_TMPL),
+    "reverse_ideas": (_REVERSE_IDEAS_SYSTEM, _REVERSE_IDEAS_TMPL),
+    "reverse_ideas_multi": (_REVERSE_IDEAS_MULTI_SYSTEM, _REVERSE_IDEAS_MULTI_TMPL),
+    "suggest": (_SUGGEST_SYSTEM, _SUGGEST_TMPL),
+}
+
+
+def _call_structured(name: str, expected_key: str, vars: Dict[str, Any],
+                     temperature: float, max_tokens: int,
+                     model: str = DEFAULT_MODEL, cache: bool = True) -> Tuple[Any, bool]:
+    """
+    Render template `name`, call Gemini and parse the JSON reply.
+    Returns (parsed, ok) where ok means parsed is a dict with a non-empty `expected_key`.
+    """
+    system, template = _TEMPLATES[name]
+    text = call_gemini(template.format(**vars), model=model, temperature=temperature,
+                       max_output_tokens=max_tokens, cache=cache, system=system)
+    parsed = _parse_json_from_text(text, dict)
+    return parsed, isinstance(parsed, dict) and bool(parsed.get(expected_key))
+
+
+async def _call_structured_async(name: str, expected_key: str, vars: Dict[str, Any],
+                                 temperature: float, max_tokens: int,
+                                 model: str = DEFAULT_MODEL, cache: bool = True) -> Tuple[Any, bool]:
+    """Async version of _call_structured()."""
+    system, template = _TEMPLATES[name]
+    text = await call_gemini_async(template.format(**vars), model=model, temperature=temperature,
+                                   max_output_tokens=max_tokens, cache=cache, system=system)
+    parsed = _parse_json_from_text(text, dict)
+    return parsed, isinstance(parsed, dict) and bool(parsed.get(expected_key))
+
+
+def _context_text(context: Optional[Dict[str, Any]]) -> str:
+    # Build a short context description for the prompt
+    ctx = context or {}
+    ctx_lines = []
+    if ctx.get("sector"):
+        ctx_lines.append(f"Sector: {ctx.get('sector')}")
+    if ctx.get("region"):
+        ctx_lines.append(f"Region: {ctx.get('region')}")
+    if ctx.get("beneficiaries"):
+        ctx_lines.append(f"Beneficiaries: {ctx.get('beneficiaries')}")
+    if ctx.get("budget"):
+        ctx_lines.append(f"Budget: {ctx.get('budget')}")
+    if ctx.get("technologies"):
+        ctx_lines.append(f"Technologies: {ctx.get('technologies')}")
+    if ctx.get("constraints"):
+        ctx_lines.append(f"Constraints: {ctx.get('constraints')}")
+    return "\n".join(ctx_lines) if ctx_lines else "None"
 
+
+def _merge_sdg_fallback(parsed: Any, fb_parsed: Any) -> Optional[Dict[str, Any]]:
+    """Merge the SDG classifier output into a full analysis structure, or None if it has no SDGs."""
+    if not (isinstance(fb_parsed, dict) and fb_parsed.get("sdgs")):
+        return None
+    # Preserve any other fields from original parse if present
+    return {
+        "sdgs": fb_parsed.get("sdgs", []),
+        "sustainability_impact": parsed.get("sustainability_impact", "Unknown") if isinstance(parsed, dict) else "Unknown",
+        "feasibility_score": parsed.get("feasibility_score", 0) if isinstance(parsed, dict) else 0,
+        "risks": parsed.get("risks", {"environmental": [], "social": [], "economic": []}) if isinstance(parsed, dict) else {"environmental": [], "social": [], "economic": []},
+        "recommendations": parsed.get("recommendations", []) if isinstance(parsed, dict) else [],
+        "notes": parsed.get("notes", "Parser fallback — SDG classifier used.") if isinstance(parsed, dict) else "Parser fallback — SDG classifier used.",
+    }
+
+
+def _sdg_parse_failure(parsed: Any) -> Dict[str, Any]:
     # If parsing failed entirely, return fallback structure with raw text
     return {
         "sdgs": [],
@@ -343,6 +852,147 @@ Project:
     }
 
 
+_ANALYZE_TEMPERATURE = 0.15
+
+
+def analyze_sdg(project_text: str,
+                model: str = DEFAULT_MODEL) -> Dict[str, Any]:
+    """
+    Send project_text to Gemini and ask for a structured SDG analysis.
+    Returns a dict with keys:
+    - sdgs: list of {id:int, short_name:str, score:int (0-100), explanation:str}
+    - sustainability_impact: "Low"/"Medium"/"High"
+    - feasibility_score: int (1-10)
+    - risks: {environmental:[], social:[], economic:[]}
+    - recommendations: [str...]
+    - notes: optional additional notes
+
+    The prompt forces Gemini to return JSON ONLY with that structure.
+
+    Near-duplicate descriptions (see semantic_cache.py) reuse an earlier analysis.
+    """
+    vec = semantic_cache.embed(project_text)
+    hit = semantic_cache.lookup(vec, model)
+    if hit is not None:
+        return hit
+
+    parsed, ok = _call_structured("analyze_sdg", "sdgs", {"project_text": project_text},
+                                  _ANALYZE_TEMPERATURE, 700, model=model)
+
+    # If we successfully parsed and have SDGs, return immediately.
+    if ok:
+        if _ANALYZE_TEMPERATURE <= CACHE_MAX_TEMPERATURE:
+            semantic_cache.add(vec, model, parsed)
+        return parsed
+
+    # Fallback: sometimes the model returns useful text but misses the JSON schema.
+    # Ask a focused SDG classifier prompt to extract 3 relevant SDGs when initial parse failed.
+    try:
+        fb_parsed, _ = _call_structured("sdg_fallback", "sdgs", {"project_text": project_text}, 0.0, 300, model=model)
+        merged = _merge_sdg_fallback(parsed, fb_parsed)
+        if merged:
+            return merged
+    except Exception:
+        # ignore fallback errors and fall through to final fallback
+        pass
+
+    return _sdg_parse_failure(parsed)
+
+
+async def analyze_sdg_async(project_text: str,
+                            model: str = DEFAULT_MODEL) -> Dict[str, Any]:
+    """Async version of analyze_sdg(); same prompt, fallback, semantic cache and return shape."""
+    # encoding is CPU-bound, so keep it off the event loop
+    vec = await asyncio.to_thread(semantic_cache.embed, project_text)
+    hit = semantic_cache.lookup(vec, model)
+    if hit is not None:
+        return hit
+
+    parsed, ok = await _call_structured_async("analyze_sdg", "sdgs", {"project_text": project_text},
+                                              _ANALYZE_TEMPERATURE, 700, model=model)
+    if ok:
+        if _ANALYZE_TEMPERATURE <= CACHE_MAX_TEMPERATURE:
+            semantic_cache.add(vec, model, parsed)
+        return parsed
+
+    # The fallback depends on the first parse, so it can only start once that call returns.
+    try:
+        fb_parsed, _ = await _call_structured_async("sdg_fallback", "sdgs", {"project_text": project_text},
+                                                    0.0, 300, model=model)
+        merged = _merge_sdg_fallback(parsed, fb_parsed)
+        if merged:
+            return merged
+    except Exception:
+        pass
+
+    return _sdg_parse_failure(parsed)
+
+
+def _batch_prompt(project_texts: List[str]) -> str:
+    lines = [f"Return a JSON array of length {len(project_texts)} where element i is the analysis for project i.",
+             "Projects:"]
+    for i, text in enumerate(project_texts, 1):
+        lines.append(f'{i}) """{text}"""')
+    return "\n".join(lines) + "\n"
+
+
+def _split_batch(parsed: Any, count: int) -> Optional[List[Any]]:
+    """Return the per-project results if the model returned one entry per project, else None."""
+    if isinstance(parsed, dict):
+        # tolerate {"analyses": [...]} style wrappers
+        parsed = next((v for v in parsed.values() if isinstance(v, list)), None)
+    if not isinstance(parsed, list) or len(parsed) != count:
+        return None
+    return parsed
+
+
+def analyze_sdg_batch(project_texts: List[str],
+                      model: str = DEFAULT_MODEL,
+                      batch_size: int = BATCH_SIZE) -> List[Dict[str, Any]]:
+    """
+    Analyze several projects with as few Gemini calls as possible by packing up to
+    `batch_size` descriptions into one prompt. Returns one analyze_sdg()-shaped dict per
+    input, in order. If the model's array does not line up with the inputs, or an entry
+    has no SDGs, those projects are re-run individually through analyze_sdg().
+
+    More than one chunk is dispatched concurrently via analyze_sdg_batch_async().
+    """
+    texts = list(project_texts)
+    if len(texts) > batch_size:
+        return _run_async(analyze_sdg_batch_async(texts, model=model, batch_size=batch_size))
+    if not texts:
+        return []
+
+    response_text = call_gemini(_batch_prompt(texts), model=model, temperature=0.15,
+                                max_output_tokens=700 * len(texts), system=_ANALYZE_SDG_BATCH_SYSTEM)
+    items = _split_batch(_parse_json_from_text(response_text, list), len(texts))
+    if items is None:
+        return [analyze_sdg(t, model=model) for t in texts]
+    return [item if isinstance(item, dict) and item.get("sdgs") else analyze_sdg(t, model=model)
+            for t, item in zip(texts, items)]
+
+
+async def analyze_sdg_batch_async(project_texts: List[str],
+                                  model: str = DEFAULT_MODEL,
+                                  batch_size: int = BATCH_SIZE) -> List[Dict[str, Any]]:
+    """Async version of analyze_sdg_batch(); chunks are sent concurrently."""
+    texts = list(project_texts)
+    chunks = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    results = await asyncio.gather(*(_analyze_chunk_async(c, model) for c in chunks))
+    return [r for chunk in results for r in chunk]
+
+
+async def _analyze_chunk_async(texts: List[str], model: str) -> List[Dict[str, Any]]:
+    response_text = await call_gemini_async(_batch_prompt(texts), model=model, temperature=0.15,
+                                            max_output_tokens=700 * len(texts), system=_ANALYZE_SDG_BATCH_SYSTEM)
+    items = _split_batch(_parse_json_from_text(response_text, list), len(texts)) or [None] * len(texts)
+    retry_idx = [i for i, item in enumerate(items) if not (isinstance(item, dict) and item.get("sdgs"))]
+    retried = await asyncio.gather(*(analyze_sdg_async(texts[i], model=model) for i in retry_idx))
+    for i, result in zip(retry_idx, retried):
+        items[i] = result
+    return items
+
+
 def generate_pitch(project_text: str,
                    model: str = DEFAULT_MODEL) -> Dict[str, Any]:
     """
@@ -355,90 +1005,58 @@ def generate_pitch(project_text: str,
     }
     Output MUST be JSON only.
     """
-    prompt = f"""
-You are EcoMind AI, an expert startup / sustainability pitch writer. Given a project description, produce JSON only with these keys:
-{{
-  "pitch": "<2-4 sentence marketing & technical pitch summary suitable for a slide or email>",
-  "elevator": "<one-sentence concise hook>",
-  "bullet_points": ["<3 short bullets summarizing benefits/impact/ask>"]
-}}
+    parsed, ok = _call_structured("pitch", "pitch", {"project_text": project_text}, 0.25, 360, model=model)
+    return parsed if ok else {"pitch": "", "elevator": "", "bullet_points": [], "raw": parsed}
 
-Constraints:
-- No extra commentary. Only valid JSON object.
-- Keep language clear and suitable for investors / partners; emphasize SDG impact.
-Project:
-\"\"\"{project_text}\"\"\"
-"""
-    response_text = call_gemini(prompt, model=model, temperature=0.25, max_output_tokens=360)
-    parsed = _parse_json_from_text(response_text)
-    if isinstance(parsed, dict) and "pitch" in parsed:
-        return parsed
-    else:
-        return {"pitch": "", "elevator": "", "bullet_points": [], "raw": parsed}
 
+async def generate_pitch_async(project_text: str,
+                               model: str = DEFAULT_MODEL) -> Dict[str, Any]:
+    """Async version of generate_pitch()."""
+    parsed, ok = await _call_structured_async("pitch", "pitch", {"project_text": project_text}, 0.25, 360, model=model)
+    return parsed if ok else {"pitch": "", "elevator": "", "bullet_points": [], "raw": parsed}
 
-def reverse_ideas(selected_sdg: int,
-                                    model: str = DEFAULT_MODEL,
-                                    context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """
-        Given an SDG number (1-17) and optional contextual constraints, ask Gemini to return
-        3-5 project ideas that align with the SDG and the provided context.
-
-        `context` may include keys such as:
-            - sector (e.g., 'software', 'civil', 'agriculture')
-            - region (e.g., 'East Africa', 'India')
-            - beneficiaries (e.g., 'smallholder farmers', 'urban youth')
-            - budget (e.g., '<$50k', '$50k-$200k', '>$200k')
-            - technologies (e.g., 'AI, IoT, solar')
-            - constraints (free-text constraints or priorities)
-
-        Returns a dict similar to before but with ideas tailored to the context.
-        """
-        ctx = context or {}
-        # Build a short context description for the prompt
-        ctx_lines = []
-        if ctx.get("sector"):
-                ctx_lines.append(f"Sector: {ctx.get('sector')}")
-        if ctx.get("region"):
-                ctx_lines.append(f"Region: {ctx.get('region')}")
-        if ctx.get("beneficiaries"):
-                ctx_lines.append(f"Beneficiaries: {ctx.get('beneficiaries')}")
-        if ctx.get("budget"):
-                ctx_lines.append(f"Budget: {ctx.get('budget')}")
-        if ctx.get("technologies"):
-                ctx_lines.append(f"Technologies: {ctx.get('technologies')}")
-        if ctx.get("constraints"):
-                ctx_lines.append(f"Constraints: {ctx.get('constraints')}")
-
-        context_text = "\n".join(ctx_lines) if ctx_lines else "None"
-
-        prompt = f"""
-You are EcoMind AI, an ideation engine for Sustainable Development Goals (SDGs).
-Given the SDG number and the project context, return JSON only with the structure:
-{{
-    "sdg": {selected_sdg},
-    "sdg_name": "<short sdg name>",
-    "ideas": [
-        {{"title": "<short idea title>", "description": "<1-2 sentence description>", "why_it_fits": "<short reasoning>", "key_steps": ["..."], "estimated_budget": "<budget range>", "improvement_suggestions": ["<short suggestion 1>"]}}
-    ]
-}}
 
-Context (use these to tailor ideas):
-{context_text}
+async def analyze_project_bundle(project_text: str,
+                                 model: str = DEFAULT_MODEL) -> Dict[str, Any]:
+    """
+    Run the SDG analysis and pitch generation for one project concurrently.
+    Returns {"analysis": <analyze_sdg result>, "pitch": <generate_pitch result>}.
+    From sync code use analyze_project_bundle_sync().
+    """
+    analysis, pitch = await asyncio.gather(
+        analyze_sdg_async(project_text, model=model),
+        generate_pitch_async(project_text, model=model),
+    )
+    return {"analysis": analysis, "pitch": pitch}
 
-Requirements:
-- Return 3 to 5 distinct, realistic, and actionable project ideas aligned to SDG #{selected_sdg} and the context above.
-- Each description must be 1-2 sentences describing scope, impact, and one practical implementation note.
-- Include a short `why_it_fits` and 2-3 `key_steps` for implementation, plus an `estimated_budget` suggestion.
-- Output ONLY valid JSON (no markdown, no commentary).
-"""
 
-        response_text = call_gemini(prompt, model=model, temperature=0.6, max_output_tokens=700)
-        parsed = _parse_json_from_text(response_text)
-        if isinstance(parsed, dict) and "ideas" in parsed:
-            return parsed
-        else:
-            return {"sdg": selected_sdg, "sdg_name": "", "ideas": [], "raw": parsed}
+def analyze_project_bundle_sync(project_text: str,
+                                model: str = DEFAULT_MODEL) -> Dict[str, Any]:
+    """Blocking wrapper around analyze_project_bundle(); must not be called from a running event loop."""
+    return _run_async(analyze_project_bundle(project_text, model=model))
+
+
+def reverse_ideas(selected_sdg: int,
+                  model: str = DEFAULT_MODEL,
+                  context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Given an SDG number (1-17) and optional contextual constraints, ask Gemini to return
+    3-5 project ideas that align with the SDG and the provided context.
+
+    `context` may include keys such as:
+        - sector (e.g., 'software', 'civil', 'agriculture')
+        - region (e.g., 'East Africa', 'India')
+        - beneficiaries (e.g., 'smallholder farmers', 'urban youth')
+        - budget (e.g., '<$50k', '$50k-$200k', '>$200k')
+        - technologies (e.g., 'AI, IoT, solar')
+        - constraints (free-text constraints or priorities)
+
+    Returns a dict similar to before but with ideas tailored to the context.
+    """
+    parsed, ok = _call_structured("reverse_ideas", "ideas",
+                                  {"sdg": selected_sdg, "context_text": _context_text(context)},
+                                  0.6, 700, model=model, cache=False)
+    return parsed if ok else {"sdg": selected_sdg, "sdg_name": "", "ideas": [], "raw": parsed}
 
 
 def reverse_ideas_multi(selected_sdgs: List[int],
@@ -457,58 +1075,11 @@ def reverse_ideas_multi(selected_sdgs: List[int],
     `covered_sdgs`) and the prompt enforces that every returned idea addresses ALL
     selected SDGs so judges can evaluate multi-goal solutions.
     """
-    ctx = context or {}
-    ctx_lines = []
-    if ctx.get("sector"):
-        ctx_lines.append(f"Sector: {ctx.get('sector')}")
-    if ctx.get("region"):
-        ctx_lines.append(f"Region: {ctx.get('region')}")
-    if ctx.get("beneficiaries"):
-        ctx_lines.append(f"Beneficiaries: {ctx.get('beneficiaries')}")
-    if ctx.get("budget"):
-        ctx_lines.append(f"Budget: {ctx.get('budget')}")
-    if ctx.get("technologies"):
-        ctx_lines.append(f"Technologies: {ctx.get('technologies')}")
-    if ctx.get("constraints"):
-        ctx_lines.append(f"Constraints: {ctx.get('constraints')}")
-
-    context_text = "\n".join(ctx_lines) if ctx_lines else "None"
-    sdg_list_str = ", ".join(str(s) for s in selected_sdgs)
-
-    prompt = f"""
-You are EcoMind AI, an ideation engine for Sustainable Development Goals (SDGs).
-Given the list of SDG numbers below and an optional project context, propose 3 to 5
-distinct, realistic, and actionable project ideas that ADDRESS ALL of the listed SDGs.
-
-Return ONLY valid JSON with this structure:
-{{
-  "covered_sdgs": [{sdg_list_str}],
-  "ideas": [
-    {{
-      "title": "<short idea title>",
-      "description": "<1-2 sentence description>",
-      "why_it_fits": "<short explanation why this idea advances each listed SDG>",
-      "key_steps": ["step 1", "step 2"],
-      "estimated_budget": "<budget range>",
-      "improvement_suggestions": ["..."],
-      "covered_sdgs": [{sdg_list_str}]
-    }}
-  ]
-}}
-
-Context (use to tailor ideas):
-{context_text}
-
-Requirements:
-- Each returned idea MUST address ALL of the SDG numbers: {sdg_list_str}.
-- For `why_it_fits` explicitly mention how the idea advances each SDG by number/name.
-- Provide 2-4 `key_steps` and an `estimated_budget` for implementation.
-- Output only the JSON object (no markdown or extra text).
-"""
-
-    response_text = call_gemini(prompt, model=model, temperature=0.65, max_output_tokens=900)
-    parsed = _parse_json_from_text(response_text)
-    if isinstance(parsed, dict) and parsed.get("ideas"):
+    parsed, ok = _call_structured("reverse_ideas_multi", "ideas",
+                                  {"sdg_list": ", ".join(str(s) for s in selected_sdgs),
+                                   "context_text": _context_text(context)},
+                                  0.65, 900, model=model, cache=False)
+    if ok:
         # Defensive: ensure top-level covered_sdgs is present
         parsed.setdefault("covered_sdgs", selected_sdgs)
         # Ensure each idea has covered_sdgs
@@ -526,23 +1097,6 @@ def suggest_improvements(project_text: str, sdg_id: int, model: str = DEFAULT_MO
 
     Returns a dict: {"sdg": sdg_id, "suggestions": ["..."], "notes": "..."}
     """
-    prompt = f"""
-You are EcoMind AI, an expert sustainability advisor. Given a short project description and a target SDG number, provide a concise, prioritized list of up to 6 actionable recommendations that would increase the project's alignment to SDG #{sdg_id}, reduce relevant risks, and improve feasibility in practical terms.
-
-Return ONLY valid JSON with keys:
-{{
-  "sdg": {sdg_id},
-  "suggestions": ["<actionable suggestion 1>", "<actionable suggestion 2>"],
-  "notes": "<short caveats or context>"
-}}
-
-Project:
-{project_text}
-"""
-
-    response_text = call_gemini(prompt, model=model, temperature=0.2, max_output_tokens=400)
-    parsed = _parse_json_from_text(response_text)
-    if isinstance(parsed, dict) and "suggestions" in parsed:
-        return parsed
-    else:
-        return {"sdg": sdg_id, "suggestions": [], "notes": "Parser fallback", "raw": parsed}
+    parsed, ok = _call_structured("suggest", "suggestions", {"sdg": sdg_id, "project_text": project_text},
+                                  0.2, 400, model=model)
+    return parsed if ok else {"sdg": sdg_id, "suggestions": [], "notes": "Parser fallback", "raw": parsed}
@@ -18,7 +18,7 @@ import os
 from typing import List, Dict
 import json
 from gemini import analyze_sdg, generate_pitch, reverse_ideas
-from utils import create_radar_chart, get_sdg_name, summarize_risks
+from utils import create_radar_chart, get_sdg_name, summarize_risks, to_radar_input
 
 # Page config
 st.set_page_config(page_title="EcoMind AI – SDG Sustainability Analyzer", layout="wide", initial_sidebar_state="auto")
@@ -32,6 +32,10 @@ def check_api_key():
     if not api_key:
         api_key = os.environ.get("GOOGLE_API_KEY")
 
+    # A comma-separated pool of keys (rotated per request by gemini.py) also works
+    if not api_key:
+        api_key = st.secrets.get("GOOGLE_API_KEYS") or os.environ.get("GOOGLE_API_KEYS")
+
     if not api_key:
         st.sidebar.error(
             "❌ Google API key not found.\n\n"
@@ -58,7 +62,7 @@ with st.sidebar:
     st.header("Quick Info")
     st.markdown("""
 - **For visitors:** No setup required — paste your project idea in the main area and click **Analyze**. This hosted instance has the model key configured by the app owner, so you don't need to set any secrets.
-- **Privacy:** Analysis runs in-session only. No results are persisted to disk.
+- **Privacy:** Analysis runs in-session only. The server keeps a local cache of model responses to avoid repeat API calls; nothing else is persisted.
 - **How it helps:** Get a quick read of which SDGs your idea aligns with, potential risks, feasibility, and AI-generated recommendations.
 """)
     st.markdown("---")
@@ -151,7 +155,7 @@ with tab1:
 
             with right:
                 st.markdown("**SDG Relevance Radar**")
-                st.plotly_chart(create_radar_chart(sdgs, title="SDG Relevance Radar"), use_container_width=True)
+                st.plotly_chart(create_radar_chart(to_radar_input(sdgs), title="SDG Relevance Radar"), use_container_width=True)
         else:
             st.info("No SDGs detected in the analysis output.")
 
@@ -406,11 +410,12 @@ This tool helps innovators and teams quickly evaluate how a project idea aligns
 - The Reverse Idea Generator lets you select an SDG and get 3–5 aligned project concepts.
 
 **Privacy & Safety**
-- No user data is stored on disk or sent to third-party services other than the Gemini API.
+- No user data is sent to third-party services other than the Gemini API. Model responses are cached on the server's disk for up to a week (operators can disable this with `ECOMIND_DISABLE_CACHE=1`).
 - Use responsibility: the model output is advisory and should be verified by experts for high-stakes decisions.
 
 **Notes for operators**
 - Set environment variable GOOGLE_API_KEY before running.
+- Responses are cached in `~/.ecomind_cache` (override with `ECOMIND_CACHE_DIR`).
 - The app relies on the Gemini API. API usage may incur charges.
 """)
     st.markdown("---")
@@ -0,0 +1,107 @@
+# ratelimit.py
+"""
+Adaptive client-side rate limiting for EcoMind AI's Gemini calls.
+
+- RateLimiter: a token bucket whose refill rate adapts to server feedback (AIMD):
+  halved on every 429, increased additively on every success.
+- limiter_for(url, api_key): one shared limiter per (API host, key) pair, since quotas
+  are enforced per key.
+
+Both the sync (requests) and async (httpx) clients in gemini.py draw from the same
+buckets, so a burst from one path slows the other down too.
+"""
+
+import time
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+DEFAULT_CAPACITY = 60
+DEFAULT_RATE_PER_MIN = 60.0
+MIN_RATE_PER_MIN = 1.0
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After is either delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    Token bucket with an adaptive refill rate.
+    acquire()/acquire_async() block until a token is available; penalize() is called on a
+    429 and reward() on a success.
+    """
+
+    def __init__(self,
+                 capacity: int = DEFAULT_CAPACITY,
+                 rate_per_min: float = DEFAULT_RATE_PER_MIN,
+                 min_rate_per_min: float = MIN_RATE_PER_MIN):
+        self.capacity = capacity
+        self.max_rate = rate_per_min / 60.0
+        self.min_rate = min_rate_per_min / 60.0
+        self.rate = self.max_rate
+        self.tokens = float(capacity)
+        self._last = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token (possibly on credit) and return how long the caller must wait."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+            self._last = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def penalize(self, retry_after: Optional[str] = None) -> float:
+        """Halve the refill rate and pause the bucket; returns the pause in seconds."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            delay = _parse_retry_after(retry_after)
+            if delay is None:
+                delay = 1.0 / self.rate
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            return delay
+
+    def reward(self) -> None:
+        """Additive increase: one more request per minute, up to the configured rate."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + 1.0 / 60.0)
+
+
+_LIMITERS: Dict[Tuple[str, Optional[str]], RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def limiter_for(url: str, api_key: Optional[str] = None) -> RateLimiter:
+    """Return the shared limiter for url's host and api_key, creating it on first use."""
+    bucket = (urlparse(url).netloc, api_key)
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(bucket)
+        if limiter is None:
+            limiter = _LIMITERS[bucket] = RateLimiter()
+        return limiter
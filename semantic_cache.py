@@ -0,0 +1,117 @@
+# semantic_cache.py
+"""
+In-process semantic cache for SDG analyses.
+
+Exact-match caching (cache.py) misses when a user rewords a description slightly
+("solar irrigation for smallholder farmers" vs "irrigation via solar for small farmers").
+This module embeds the normalized project text and returns a previous analysis when
+the cosine similarity to an earlier input is above SIMILARITY_THRESHOLD.
+
+- Embeddings come from sentence-transformers (all-MiniLM-L6-v2 by default, override
+  with ECOMIND_EMBEDDING_MODEL). It is an optional dependency: without it (or numpy),
+  or if the model fails to load, embed() returns None, lookup() always misses and
+  add() is a no-op.
+- Callers embed the text once with embed() and pass the vector to lookup() and add().
+- Entries live in memory for the lifetime of the process, one index per Gemini model.
+- Honours ECOMIND_DISABLE_CACHE like the on-disk cache.
+"""
+
+import os
+import re
+import copy
+import threading
+from typing import Any, Dict, List, Optional
+
+import cache as _cache
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    _HAS_EMBEDDINGS = True
+except Exception:
+    np = None
+    SentenceTransformer = None
+    _HAS_EMBEDDINGS = False
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+SIMILARITY_THRESHOLD = 0.92
+MAX_ENTRIES = 2048  # per Gemini model; oldest entries are dropped first
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+
+_encoder = None
+# set when the embedding model can't be loaded (e.g. offline); the load is tried once
+_encoder_failed = False
+_lock = threading.Lock()
+# model name -> {"vectors": np.ndarray (n, d), "values": [...]}
+_indexes: Dict[str, Dict[str, Any]] = {}
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace."""
+    text = _PUNCT_RE.sub(" ", text.lower())
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def _enabled() -> bool:
+    return _HAS_EMBEDDINGS and not _encoder_failed and _cache.enabled()
+
+
+def _get_encoder():
+    global _encoder, _encoder_failed
+    with _lock:
+        if _encoder is None and not _encoder_failed:
+            # loading the model takes a few seconds, so defer it until the first lookup
+            try:
+                _encoder = SentenceTransformer(os.environ.get("ECOMIND_EMBEDDING_MODEL") or DEFAULT_EMBEDDING_MODEL)
+            except Exception:
+                _encoder_failed = True
+                raise
+        return _encoder
+
+
+def embed(text: str) -> Optional["np.ndarray"]:
+    """Unit-length embedding of the normalized text, or None when the cache is unavailable."""
+    if not _enabled():
+        return None
+    try:
+        vec = _get_encoder().encode([normalize(text)], normalize_embeddings=True)[0]
+    except Exception:
+        return None
+    return np.asarray(vec, dtype=np.float32)
+
+
+def lookup(vec: Optional["np.ndarray"], model: str) -> Optional[Any]:
+    """Return a copy of the cached value for the entry most similar to vec, or None."""
+    if vec is None or not _enabled():
+        return None
+    with _lock:
+        index = _indexes.get(model)
+        if not index or not index["values"]:
+            return None
+        # rows are unit vectors, so the dot product is the cosine similarity
+        scores = index["vectors"] @ vec
+        best = int(scores.argmax())
+        if scores[best] < SIMILARITY_THRESHOLD:
+            return None
+        return copy.deepcopy(index["values"][best])
+
+
+def add(vec: Optional["np.ndarray"], model: str, value: Any) -> None:
+    """Remember value as the result for the text embedded as vec, under the given Gemini model."""
+    if vec is None or not _enabled():
+        return
+    with _lock:
+        index = _indexes.get(model)
+        if index is None:
+            _indexes[model] = {"vectors": vec[None, :], "values": [copy.deepcopy(value)]}
+            return
+        vectors = np.vstack([index["vectors"], vec[None, :]])[-MAX_ENTRIES:]
+        values: List[Any] = (index["values"] + [copy.deepcopy(value)])[-MAX_ENTRIES:]
+        index["vectors"], index["values"] = vectors, values
+
+
+def clear() -> None:
+    with _lock:
+        _indexes.clear()
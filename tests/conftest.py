@@ -0,0 +1,8 @@
+import os
+import sys
+
+# the app modules live at the repository root rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# keep test runs away from the on-disk response cache
+os.environ.setdefault("ECOMIND_DISABLE_CACHE", "1")
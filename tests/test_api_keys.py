@@ -0,0 +1,38 @@
+import pytest
+
+import gemini
+
+
+@pytest.fixture(autouse=True)
+def _isolated_keys(monkeypatch):
+    for name in ("GOOGLE_API_KEY", "GOOGLE_API_KEYS", "GOOGLE_API_KEY_STAGING"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(gemini, "_ST", None)
+    gemini.clear_api_key_cache()
+    yield
+    gemini.clear_api_key_cache()
+
+
+def test_keys_in_rotation_order(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEYS", "a, b,a")
+    monkeypatch.setenv("GOOGLE_API_KEY", "c")
+    assert gemini._get_api_keys() == ("a", "b", "c")
+    assert [gemini._next_api_key() for _ in range(4)] == ["a", "b", "c", "a"]
+
+
+def test_keys_are_memoized_until_cleared(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "old")
+    assert gemini._get_api_keys() == ("old",)
+    monkeypatch.setenv("GOOGLE_API_KEY", "new")
+    assert gemini._get_api_keys() == ("old",)
+    gemini.clear_api_key_cache()
+    assert gemini._get_api_keys() == ("new",)
+    assert gemini._next_api_key() == "new"
+
+
+def test_missing_keys_are_not_memoized(monkeypatch):
+    assert gemini._get_api_keys() == ()
+    assert gemini._next_api_key() is None
+    monkeypatch.setenv("GOOGLE_API_KEY", "late")
+    assert gemini._get_api_keys() == ("late",)
+    assert gemini._next_api_key() == "late"
@@ -0,0 +1,50 @@
+from gemini import _parse_json_from_text
+
+
+def test_plain_object():
+    assert _parse_json_from_text('{"sdgs": [1, 2]}') == {"sdgs": [1, 2]}
+
+
+def test_object_after_bracketed_aside():
+    assert _parse_json_from_text('see [1] then {"sdgs": [1]}') == {"sdgs": [1]}
+
+
+def test_surrounding_prose():
+    text = 'Here is the analysis:\n{"sdgs": [7]}\nHope this helps!'
+    assert _parse_json_from_text(text) == {"sdgs": [7]}
+
+
+def test_braces_inside_strings():
+    text = 'x {"summary": "uses {curly} and [square] } brackets", "q": "say \\"hi\\""} y'
+    assert _parse_json_from_text(text) == {"summary": "uses {curly} and [square] } brackets", "q": 'say "hi"'}
+
+
+def test_skips_undecodable_block():
+    assert _parse_json_from_text('note {not json} then {"sdgs": [3]}') == {"sdgs": [3]}
+
+
+def test_single_quote_repair():
+    assert _parse_json_from_text("{'sdgs': [4]}") == {"sdgs": [4]}
+
+
+def test_list_expected():
+    text = 'Results: [{"sdgs": [1]}, {"sdgs": [2]}]'
+    assert _parse_json_from_text(text, list) == [{"sdgs": [1]}, {"sdgs": [2]}]
+
+
+def test_list_inside_wrapper_object():
+    text = '{"analyses": [{"sdgs": [5]}]}'
+    assert _parse_json_from_text(text, list) == [{"sdgs": [5]}]
+
+
+def test_falls_back_to_other_type():
+    assert _parse_json_from_text("[1, 2]") == [1, 2]
+
+
+def test_unterminated_input():
+    text = '{"sdgs": [1, 2'
+    assert _parse_json_from_text(text) == {"raw_text": text}
+
+
+def test_no_json():
+    assert _parse_json_from_text("no json here") == {"raw_text": "no json here"}
@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+from ratelimit import RateLimiter, _parse_retry_after, limiter_for
+
+
+def test_penalize_halves_rate():
+    limiter = RateLimiter(rate_per_min=60)
+    limiter.penalize()
+    assert limiter.rate == pytest.approx(0.5)
+    limiter.penalize()
+    assert limiter.rate == pytest.approx(0.25)
+
+
+def test_penalize_stops_at_min_rate():
+    limiter = RateLimiter(rate_per_min=4, min_rate_per_min=1)
+    for _ in range(10):
+        limiter.penalize()
+    assert limiter.rate == pytest.approx(1 / 60)
+
+
+def test_penalize_honours_retry_after():
+    limiter = RateLimiter()
+    assert limiter.penalize("7") == 7.0
+    assert limiter._reserve() == pytest.approx(7.0, abs=0.1)
+
+
+def test_penalize_without_retry_after_waits_one_interval():
+    limiter = RateLimiter(rate_per_min=60)
+    assert limiter.penalize() == pytest.approx(2.0)
+
+
+def test_reward_is_additive_and_capped():
+    limiter = RateLimiter(rate_per_min=60)
+    limiter.penalize()
+    limiter.reward()
+    assert limiter.rate == pytest.approx(0.5 + 1 / 60)
+    for _ in range(100):
+        limiter.reward()
+    assert limiter.rate == pytest.approx(1.0)
+
+
+def test_bucket_waits_once_empty():
+    limiter = RateLimiter(capacity=2, rate_per_min=60)
+    assert limiter._reserve() == 0
+    assert limiter._reserve() == 0
+    assert limiter._reserve() == pytest.approx(1.0, abs=0.05)
+
+
+def test_parse_retry_after():
+    assert _parse_retry_after(None) is None
+    assert _parse_retry_after("3") == 3.0
+    assert _parse_retry_after("garbage") is None
+    date = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 30))
+    assert _parse_retry_after(date) == pytest.approx(30, abs=2)
+
+
+def test_limiter_per_host_and_key():
+    a = limiter_for("https://example.test/v1/models/x", "k1")
+    assert limiter_for("https://example.test/v1/models/y", "k1") is a
+    assert limiter_for("https://example.test/v1/models/x", "k2") is not a
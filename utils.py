@@ -2,15 +2,19 @@
 """
 Utility functions for EcoMind AI Streamlit app.
 - create_radar_chart: uses plotly to render a radar/spider chart for SDG scores
+  (cached with st.cache_data; build its input with to_radar_input)
 - sdg_color_map / sdg_name_map: small helpers for display
 """
 
 from typing import Dict, List, Tuple
+import numpy as np
 import plotly.graph_objects as go
+import streamlit as st
 import math
+from types import MappingProxyType
 
 # Minimal SDG names mapping (1-17). You can expand these if desired.
-SDG_NAMES = {
+SDG_NAMES = MappingProxyType({
     1: "No Poverty",
     2: "Zero Hunger",
     3: "Good Health",
@@ -28,38 +32,47 @@ SDG_NAMES = {
     15: "Life on Land",
     16: "Peace & Justice",
     17: "Partnerships"
-}
+})
+
+# "<id>: <name>" chart labels, built once at import.
+SDG_LABELS = MappingProxyType({i: f"{i}: {n}" for i, n in SDG_NAMES.items()})
 
 def get_sdg_name(sdg_id: int) -> str:
     return SDG_NAMES.get(sdg_id, f"SDG {sdg_id}")
 
-def create_radar_chart(sdgs: List[Dict], title: str = "SDG Relevance") -> go.Figure:
+def to_radar_input(sdgs: List[Dict]) -> Tuple[Tuple[int, str, float], ...]:
     """
-    sdgs: list of dicts with keys 'id', 'short_name' (optional), 'score' (0-100)
-    Returns a Plotly Figure (radar/spider chart).
+    Convert the analysis' list of SDG dicts into the hashable (id, short_name, score)
+    tuples accepted by create_radar_chart. Non-numeric scores become 0.
     """
-    # Prepare labels and values
-    labels = []
-    values = []
+    out = []
     for s in sdgs:
-        sid = s.get("id")
-        name = s.get("short_name") or get_sdg_name(sid)
-        labels.append(f"{sid}: {name}")
-        # Ensure numeric
         try:
             score = float(s.get("score", 0))
-        except Exception:
+        except (TypeError, ValueError):
             score = 0.0
-        # Clip to [0,100]
-        score = max(0.0, min(100.0, score))
-        values.append(score)
+        out.append((s.get("id"), s.get("short_name") or "", score))
+    return tuple(out)
 
-    if not labels:
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def create_radar_chart(sdgs: Tuple[Tuple[int, str, float], ...], title: str = "SDG Relevance") -> go.Figure:
+    """
+    sdgs: tuple of (id, short_name, score 0-100) tuples, see to_radar_input().
+    Returns a Plotly Figure (radar/spider chart). Cached per (sdgs, title) so Streamlit
+    reruns with the same analysis reuse the figure; the 64 most recent figures are kept.
+    """
+    if not sdgs:
         # empty figure
         fig = go.Figure()
         fig.update_layout(title=title)
         return fig
 
+    # Prepare labels and values
+    labels = [SDG_LABELS.get(sid) or f"{sid}: {name or get_sdg_name(sid)}" for sid, name, _ in sdgs]
+    # Clip to [0,100]
+    values = np.clip(np.fromiter((s[2] for s in sdgs), dtype=np.float64, count=len(sdgs)), 0, 100).tolist()
+
     # Radar needs closing the loop
     labels_loop = labels + [labels[0]]
     values_loop = values + [values[0]]
@@ -89,12 +102,12 @@ def create_radar_chart(sdgs: List[Dict], title: str = "SDG Relevance") -> go.Fig
     return fig
 
 
+# (risks key, display name) in display order
+_RISK_CATEGORIES = (("environmental", "Environmental"), ("social", "Social"), ("economic", "Economic"))
+
+
 def summarize_risks(risks: Dict[str, List[str]]) -> List[Tuple[str, str]]:
     """
     Convert risks dict to a list of tuples for display: (category, combined_text)
     """
-    out = []
-    for k in ["environmental", "social", "economic"]:
-        items = risks.get(k) or []
-        out.append((k.capitalize(), " • ".join(items) if items else "None identified"))
-    return out
+    return [(disp, " • ".join(risks.get(k) or []) or "None identified") for k, disp in _RISK_CATEGORIES]